@@ -1,23 +1,68 @@
 """Handle HTTP requests to web APIs."""
 
+import gzip
 import json
 import logging as lg
+import mmap
+import os
 import socket
+import sys
+import threading
+from functools import lru_cache
 from hashlib import sha1
 from pathlib import Path
+from urllib.parse import urlencode
 from urllib.parse import urlparse
 
 import requests
-from requests.exceptions import JSONDecodeError
 
 from . import settings
 from . import utils
 from ._errors import InsufficientResponseError
 from ._errors import ResponseStatusCodeError
 
+# orjson is an optional dependency for faster JSON (de)serialization
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 # capture getaddrinfo function to use original later after mutating it
 _original_getaddrinfo = socket.getaddrinfo
 
+# map of hostname -> IP address that socket.getaddrinfo resolves to once
+# _config_dns has been called
+_resolved_hosts = {}
+
+# reuse one session across requests to pool connections to each server,
+# rather than doing a new TCP and TLS handshake for every request. forked
+# child processes get a new session (see below) so they never send requests
+# over, or read responses from, the parent process's pooled sockets
+_session = requests.Session()
+
+# python 3.9+ lets us flag the cache key hash as not security-related
+_sha1_kwargs = {"usedforsecurity": False} if sys.version_info >= (3, 9) else {}
+
+
+def _reset_session():
+    """
+    Replace the shared HTTP session with a new one.
+
+    Called in forked child processes, so that they open their own connections
+    instead of reusing the connections pooled by the parent process.
+
+    Returns
+    -------
+    None
+    """
+    global _session  # noqa: PLW0603
+    _session = requests.Session()
+
+
+# os.register_at_fork is only available on platforms that can fork
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session)
+
 
 def _save_to_cache(url, response_json, ok):
     """
@@ -29,8 +74,8 @@ def _save_to_cache(url, response_json, ok):
     cache file if settings.use_cache is True, response_json is not None, and
     ok is True.
 
-    Users should always pass OrderedDicts instead of dicts of parameters into
-    request functions, so the parameters remain in the same order each time,
+    Users should always insert parameters into the dicts passed to request
+    functions in the same order each time (dicts preserve insertion order),
     producing the same URL string, and thus the same hash. Otherwise the cache
     will eventually contain multiple saved responses for the same request
     because the URL's parameters appeared in a different order each time.
@@ -56,42 +101,156 @@ def _save_to_cache(url, response_json, ok):
             utils.log("Did not save to cache because response_json is None")
 
         else:
-            # create the folder on the disk if it doesn't already exist
+            # hash the url to make the filename succinct but unique
             cache_folder = Path(settings.cache_folder)
-            cache_folder.mkdir(parents=True, exist_ok=True)
+            cache_filepath = cache_folder / _cache_filename(url)
 
-            # hash the url to make the filename succinct but unique
-            # sha1 digest is 160 bits = 20 bytes = 40 hexadecimal characters
-            filename = sha1(url.encode("utf-8")).hexdigest() + ".json"
-            cache_filepath = cache_folder / filename
+            # dump to gzip-compressed json (fastest compression level still
+            # shrinks Overpass responses ~5x) and save to file
+            data = gzip.compress(_dumps_json(response_json), compresslevel=1, mtime=0)
+            if _write_cache_file(cache_filepath, data):
+                utils.log(f"Saved response to cache file {str(cache_filepath)!r}")
 
-            # dump to json, and save to file
-            cache_filepath.write_text(json.dumps(response_json), encoding="utf-8")
-            utils.log(f"Saved response to cache file {str(cache_filepath)!r}")
 
+def _write_cache_file(filepath, data):
+    """
+    Atomically write data to a cache file.
+
+    Write data to a temporary file unique to this thread, then rename it to
+    filepath so a crash or a concurrent reader can never encounter a
+    partially-written cache file. The temporary file is removed if anything
+    fails. The cache folder is only created if it doesn't already exist.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path
+        path to the cache file
+    data : bytes
+        the data to write
 
-def _url_in_cache(url):
+    Returns
+    -------
+    saved : bool
+        False if the cache file could not be replaced because another
+        process has it open (on Windows), otherwise True
+    """
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    temp_filepath = filepath.with_name(filepath.name + suffix)
+    try:
+        try:
+            temp_filepath.write_bytes(data)
+        except FileNotFoundError:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            temp_filepath.write_bytes(data)
+
+        try:
+            temp_filepath.replace(filepath)
+        except PermissionError:  # pragma: no cover
+            # windows cannot replace a file another process has open, but
+            # then that process has already cached this same response
+            temp_filepath.unlink()
+            utils.log(f"Did not save to cache because {str(filepath)!r} is in use")
+            return False
+
+    except BaseException:
+        temp_filepath.unlink(missing_ok=True)
+        raise
+
+    return True
+
+
+@lru_cache(maxsize=128)
+def _cache_filename(url):
     """
-    Determine if a URL's response exists in the cache.
+    Generate the cache file name for a URL.
 
-    Calculates the checksum of url to determine the cache file's name.
+    The name is the hexadecimal SHA-1 digest of the URL (160 bits = 20 bytes
+    = 40 hexadecimal characters) with a ".json.gz" extension. SHA-1 is not
+    used for security here, just to make the file name succinct but unique,
+    so it is flagged as such where hashlib supports it. Changing the hash
+    function would orphan every response already saved in users' cache
+    folders. Results are memoized because a cache miss looks up a URL's file
+    name then saves to it.
 
     Parameters
     ----------
     url : string
-        the URL to look for in the cache
+        the URL of the request
 
     Returns
     -------
-    filepath : pathlib.Path
-        path to cached response for url if it exists, otherwise None
+    filename : string
+    """
+    return sha1(url.encode("utf-8"), **_sha1_kwargs).hexdigest() + ".json.gz"
+
+
+def _dumps_json(obj):
+    """
+    Serialize an object to UTF-8 encoded JSON bytes.
+
+    Uses orjson if it is installed, otherwise falls back on the standard
+    library's json module.
+
+    Parameters
+    ----------
+    obj : dict or list
+        the object to serialize
+
+    Returns
+    -------
+    bytes
+    """
+    if orjson is None:  # pragma: no cover
+        return json.dumps(obj).encode("utf-8")
+    return orjson.dumps(obj)
+
+
+def _loads_json(data):
+    """
+    Deserialize UTF-8 encoded JSON bytes to an object.
+
+    Uses orjson if it is installed, otherwise falls back on the standard
+    library's json module.
+
+    Parameters
+    ----------
+    data : bytes
+        the JSON document to deserialize
+
+    Returns
+    -------
+    dict or list
     """
-    # hash the url to generate the cache filename
-    filename = sha1(url.encode("utf-8")).hexdigest() + ".json"
-    filepath = Path(settings.cache_folder) / filename
+    if orjson is None:  # pragma: no cover
+        return json.loads(data)
+    return orjson.loads(data)
 
-    # if this file exists in the cache, return its full path
-    return filepath if filepath.is_file() else None
+
+def _read_cache_file(filepath):
+    """
+    Read and deserialize a JSON cache file.
+
+    Decompresses gzipped cache files. For uncompressed cache files saved by
+    older OSMnx versions, if orjson is installed, memory-map the file so
+    orjson can parse it directly from the OS page cache without first copying
+    it into memory.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path
+        path to the cache file
+
+    Returns
+    -------
+    response_json : dict
+    """
+    with filepath.open("rb") as f:
+        if filepath.suffix == ".gz":
+            return _loads_json(gzip.decompress(f.read()))
+        if orjson is None:  # pragma: no cover
+            return json.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as mv:
+            return orjson.loads(mv)
 
 
 def _retrieve_from_cache(url, check_remark=True):
@@ -113,22 +272,33 @@ def _retrieve_from_cache(url, check_remark=True):
     """
     # if the tool is configured to use the cache
     if settings.use_cache:
-        # return cached response for this url if exists, otherwise return None
-        cache_filepath = _url_in_cache(url)
-        if cache_filepath is not None:
-            response_json = json.loads(cache_filepath.read_text(encoding="utf-8"))
-
-            # return None if check_remark is True and there is a server
-            # remark in the cached response
-            if check_remark and "remark" in response_json:  # pragma: no cover
-                utils.log(
-                    f"Ignoring cache file {str(cache_filepath)!r} because "
-                    f"it contains a remark: {response_json['remark']!r}"
-                )
+        # hash the url to generate the cache filename, then just try to read
+        # it rather than first checking if it exists, to save a stat syscall
+        cache_filepath = Path(settings.cache_folder) / _cache_filename(url)
+        try:
+            response_json = _read_cache_file(cache_filepath)
+        except FileNotFoundError:
+            # fall back on an uncompressed cache file saved by older versions.
+            # for compatibility, this means a cache miss costs two failed
+            # opens rather than one, and only these legacy files get mmapped
+            cache_filepath = cache_filepath.with_suffix("")
+            try:
+                response_json = _read_cache_file(cache_filepath)
+            except FileNotFoundError:
+                # there is no cached response for this url
                 return None
 
-            utils.log(f"Retrieved response from cache file {str(cache_filepath)!r}")
-            return response_json
+        # return None if check_remark is True and there is a server
+        # remark in the cached response
+        if check_remark and "remark" in response_json:  # pragma: no cover
+            utils.log(
+                f"Ignoring cache file {str(cache_filepath)!r} because "
+                f"it contains a remark: {response_json['remark']!r}"
+            )
+            return None
+
+        utils.log(f"Retrieved response from cache file {str(cache_filepath)!r}")
+        return response_json
     return None
 
 
@@ -193,11 +363,11 @@ def _resolve_host_via_doh(hostname):
     err_msg = f"Failed to resolve {hostname!r} IP via DoH, requesting host by name"
     try:
         url = settings.doh_url_template.format(hostname=hostname)
-        response = requests.get(url, timeout=settings.timeout)
-        data = response.json()
+        response = _session.get(url, timeout=settings.timeout)
+        data = _loads_json(response.content)
 
     # if we cannot reach DoH server or resolve host, return hostname itself
-    except requests.exceptions.RequestException:  # pragma: no cover
+    except (requests.exceptions.RequestException, ValueError):  # pragma: no cover
         utils.log(err_msg, level=lg.ERROR)
         return hostname
 
@@ -230,6 +400,11 @@ def _config_dns(url):
     server lambert. This could result in violating server lambert's slot
     management timing.
 
+    The hostname's IP address is recorded in a module-level dict that a
+    single replacement getaddrinfo function consults, so repeated calls just
+    update that mapping. If the IP address changes, the shared session's
+    pooled connections are closed so later requests connect to the new one.
+
     Parameters
     ----------
     url : string
@@ -250,22 +425,79 @@ def _config_dns(url):
         )
         ip = _resolve_host_via_doh(hostname)
 
-    # mutate socket.getaddrinfo to map hostname -> IP address
-    def _getaddrinfo(*args, **kwargs):
-        if args[0] == hostname:
-            utils.log(f"Resolved {hostname!r} to {ip!r}")
-            return _original_getaddrinfo(ip, *args[1:], **kwargs)
-
-        # otherwise
-        return _original_getaddrinfo(*args, **kwargs)
+    # if hostname now resolves to a different IP address, drop the session's
+    # pooled connections: otherwise the status check could reuse a kept-alive
+    # connection to the old server, then the query (if that connection closes
+    # during the pause) reconnect to the new one
+    if _resolved_hosts.get(hostname) != ip:
+        _session.close()
 
+    # map hostname -> IP address and make sure socket.getaddrinfo uses it
+    _resolved_hosts[hostname] = ip
     socket.getaddrinfo = _getaddrinfo
 
 
+def _getaddrinfo(host, *args, **kwargs):
+    """
+    Call socket.getaddrinfo with a host's configured IP address if it has one.
+
+    Parameters
+    ----------
+    host : string
+        the hostname or IP address to resolve
+    *args
+        the remaining positional arguments to pass to socket.getaddrinfo
+    **kwargs
+        the keyword arguments to pass to socket.getaddrinfo
+
+    Returns
+    -------
+    list
+    """
+    ip = _resolved_hosts.get(host)
+    if ip is not None:
+        utils.log(f"Resolved {host!r} to {ip!r}")
+        return _original_getaddrinfo(ip, *args, **kwargs)
+
+    # otherwise
+    return _original_getaddrinfo(host, *args, **kwargs)
+
+
+def _prepare_url(url, params):
+    """
+    Make the GET-style URL of a request, to use as its cache key.
+
+    Equivalent to `requests.Request("GET", url, params=params).prepare().url`
+    for the endpoint URLs and parameters that OSMnx sends, but without all of
+    the overhead of preparing a complete request just to get its URL.
+    Parameters with a value of None are omitted, just as requests does.
+
+    Parameters
+    ----------
+    url : string
+        the URL of the request, without parameters
+    params : dict
+        key-value pairs of parameters
+
+    Returns
+    -------
+    prepared_url : string
+    """
+    query = urlencode([(k, v) for k, v in params.items() if v is not None], doseq=True)
+    if not query:  # pragma: no cover
+        return url
+    separator = "&" if "?" in url else "?"
+    return url + separator + query
+
+
+@lru_cache(maxsize=64)
 def _hostname_from_url(url):
     """
     Extract the hostname (domain) from a URL.
 
+    Results are memoized because the same few API endpoint URLs are parsed
+    before every request.
+
     Parameters
     ----------
     url : string
@@ -299,8 +531,11 @@ def _parse_response(response):
 
     # parse the response to JSON and log/raise exceptions
     try:
-        response_json = response.json()
-    except JSONDecodeError as e:  # pragma: no cover
+        response_json = _loads_json(response.content)
+
+    # catch ValueError: it is the base of JSONDecodeError and orjson's, and of
+    # UnicodeDecodeError that json raises if the body isn't valid UTF-8
+    except ValueError as e:  # pragma: no cover
         msg = f"{domain!r} responded: {response.status_code} {response.reason} {response.text}"
         utils.log(msg, level=lg.ERROR)
         if response.ok:
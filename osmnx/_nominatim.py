@@ -2,9 +2,6 @@
 
 import logging as lg
 import time
-from collections import OrderedDict
-
-import requests
 
 from . import _downloader
 from . import settings
@@ -32,7 +29,7 @@ def _download_nominatim_element(query, by_osmid=False, limit=1, polygon_geojson=
         JSON response from the Nominatim server
     """
     # define the parameters
-    params = OrderedDict()
+    params = {}
     params["format"] = "json"
     params["polygon_geojson"] = polygon_geojson
 
@@ -70,7 +67,7 @@ def _nominatim_request(params, request_type="search", pause=1, error_pause=60):
 
     Parameters
     ----------
-    params : OrderedDict
+    params : dict
         key-value pairs of parameters
     request_type : string {"search", "reverse", "lookup"}
         which Nominatim API endpoint to query
@@ -91,7 +88,7 @@ def _nominatim_request(params, request_type="search", pause=1, error_pause=60):
     # prepare Nominatim API URL and see if request already exists in cache
     url = settings.nominatim_endpoint.rstrip("/") + "/" + request_type
     params["key"] = settings.nominatim_key
-    prepared_url = requests.Request("GET", url, params=params).prepare().url
+    prepared_url = _downloader._prepare_url(url, params)
     cached_response_json = _downloader._retrieve_from_cache(prepared_url)
     if cached_response_json is not None:
         return cached_response_json
@@ -103,7 +100,7 @@ def _nominatim_request(params, request_type="search", pause=1, error_pause=60):
 
     # transmit the HTTP GET request
     utils.log(f"Get {prepared_url} with timeout={settings.timeout}")
-    response = requests.get(
+    response = _downloader._session.get(
         url,
         params=params,
         timeout=settings.timeout,
@@ -2,10 +2,10 @@
 
 import datetime as dt
 import logging as lg
+import math
 import time
+from functools import lru_cache
 
-import numpy as np
-import requests
 from requests.exceptions import ConnectionError
 
 from . import _downloader
@@ -24,6 +24,25 @@ def _get_osm_filter(network_type):
     network_type : string {"all_private", "all", "bike", "drive", "drive_service", "walk"}
         what type of street network to get
 
+    Returns
+    -------
+    string
+    """
+    return _make_osm_filter(network_type, settings.default_access)
+
+
+@lru_cache(maxsize=16)
+def _make_osm_filter(network_type, default_access):
+    """
+    Make (and memoize) a filter to query OSM for the specified network type.
+
+    Parameters
+    ----------
+    network_type : string {"all_private", "all", "bike", "drive", "drive_service", "walk"}
+        what type of street network to get
+    default_access : string
+        the access filter to apply to all network types except "all_private"
+
     Returns
     -------
     string
@@ -37,7 +56,7 @@ def _get_osm_filter(network_type):
     # anything specifying motor=no. also filter out any non-service roads that
     # are tagged as providing certain services
     filters["drive"] = (
-        f'["highway"]["area"!~"yes"]{settings.default_access}'
+        f'["highway"]["area"!~"yes"]{default_access}'
         f'["highway"!~"abandoned|bridleway|bus_guideway|construction|corridor|cycleway|elevator|'
         f"escalator|footway|no|path|pedestrian|planned|platform|proposed|raceway|razed|service|"
         f'steps|track"]'
@@ -47,7 +66,7 @@ def _get_osm_filter(network_type):
 
     # drive+service: allow ways tagged 'service' but filter out certain types
     filters["drive_service"] = (
-        f'["highway"]["area"!~"yes"]{settings.default_access}'
+        f'["highway"]["area"!~"yes"]{default_access}'
         f'["highway"!~"abandoned|bridleway|bus_guideway|construction|corridor|cycleway|elevator|'
         f"escalator|footway|no|path|pedestrian|planned|platform|proposed|raceway|razed|steps|"
         f'track"]'
@@ -61,7 +80,7 @@ def _get_osm_filter(network_type):
     # exactly pleasant walks. some cycleways may allow pedestrians, but this
     # filter ignores such cycleways.
     filters["walk"] = (
-        f'["highway"]["area"!~"yes"]{settings.default_access}'
+        f'["highway"]["area"!~"yes"]{default_access}'
         f'["highway"!~"abandoned|bus_guideway|construction|cycleway|motor|no|planned|platform|'
         f'proposed|raceway|razed"]'
         f'["foot"!~"no"]["service"!~"private"]'
@@ -70,7 +89,7 @@ def _get_osm_filter(network_type):
     # biking: filter out foot ways, motor ways, private ways, and anything
     # specifying biking=no
     filters["bike"] = (
-        f'["highway"]["area"!~"yes"]{settings.default_access}'
+        f'["highway"]["area"!~"yes"]{default_access}'
         f'["highway"!~"abandoned|bus_guideway|construction|corridor|elevator|escalator|footway|'
         f'motor|no|planned|platform|proposed|raceway|razed|steps"]'
         f'["bicycle"!~"no"]["service"!~"private"]'
@@ -79,7 +98,7 @@ def _get_osm_filter(network_type):
     # to download all ways, just filter out everything not currently in use or
     # that is private-access only
     filters["all"] = (
-        f'["highway"]["area"!~"yes"]{settings.default_access}'
+        f'["highway"]["area"!~"yes"]{default_access}'
         f'["highway"!~"abandoned|construction|no|planned|platform|proposed|raceway|razed"]'
         f'["service"!~"private"]'
     )
@@ -100,7 +119,7 @@ def _get_osm_filter(network_type):
     return osm_filter
 
 
-def _get_overpass_pause(base_endpoint, recursive_delay=5, default_duration=60):
+def _get_overpass_pause(base_endpoint, retry_delay=5, default_duration=60):
     """
     Retrieve a pause duration from the Overpass API status endpoint.
 
@@ -112,11 +131,12 @@ def _get_overpass_pause(base_endpoint, recursive_delay=5, default_duration=60):
     ----------
     base_endpoint : string
         base Overpass API url (without "/status" at the end)
-    recursive_delay : int
-        how long to wait between recursive calls if the server is currently
+    retry_delay : int
+        how long to wait between status checks if the server is currently
         running a query
     default_duration : int
-        if fatal error, fall back on returning this value
+        if fatal error, or if the server is still running a query after this
+        many seconds of status checks, fall back on returning this value
 
     Returns
     -------
@@ -126,24 +146,37 @@ def _get_overpass_pause(base_endpoint, recursive_delay=5, default_duration=60):
         # if overpass rate limiting is False, then there is zero pause
         return 0
 
-    try:
-        url = base_endpoint.rstrip("/") + "/status"
-        response = requests.get(
-            url,
-            headers=_downloader._get_http_headers(),
-            timeout=settings.timeout,
-            **settings.requests_kwargs,
-        )
-        status = response.text.split("\n")[4]
-        status_first_token = status.split(" ")[0]
-    except ConnectionError:  # pragma: no cover
-        # cannot reach status endpoint, log error and return default duration
-        utils.log(f"Unable to query {url}, got status {response.status_code}", level=lg.ERROR)
-        return default_duration
-    except (AttributeError, IndexError, ValueError):  # pragma: no cover
-        # cannot parse output, log error and return default duration
-        utils.log(f"Unable to parse {url} response: {response.text}", level=lg.ERROR)
-        return default_duration
+    url = base_endpoint.rstrip("/") + "/status"
+    start_time = time.monotonic()
+    while True:
+        try:
+            response = _downloader._session.get(
+                url,
+                headers=_downloader._get_http_headers(),
+                timeout=settings.timeout,
+                **settings.requests_kwargs,
+            )
+            status = response.text.split("\n")[4]
+            status_first_token = status.split(" ")[0]
+        except ConnectionError:  # pragma: no cover
+            # cannot reach status endpoint, log error and return default duration
+            utils.log(f"Unable to query {url}", level=lg.ERROR)
+            return default_duration
+        except (AttributeError, IndexError, ValueError):  # pragma: no cover
+            # cannot parse output, log error and return default duration
+            utils.log(f"Unable to parse {url} response: {response.text}", level=lg.ERROR)
+            return default_duration
+
+        # if first token is 'Currently', it is currently running a query so
+        # check back in retry_delay seconds, unless it has been running for
+        # longer than default_duration already
+        if status_first_token == "Currently":  # pragma: no cover
+            if time.monotonic() - start_time >= default_duration:
+                utils.log(f"Server still running a query: {status!r}", level=lg.WARNING)
+                return default_duration
+            time.sleep(retry_delay)
+        else:
+            break
 
     try:
         # if first token is numeric, it's how many slots you have available,
@@ -158,15 +191,9 @@ def _get_overpass_pause(base_endpoint, recursive_delay=5, default_duration=60):
             pattern = "%Y-%m-%dT%H:%M:%SZ,"
             utc_time = dt.datetime.strptime(utc_time_str, pattern).astimezone(dt.timezone.utc)
             utc_now = dt.datetime.now(tz=dt.timezone.utc)
-            seconds = int(np.ceil((utc_time - utc_now).total_seconds()))
+            seconds = math.ceil((utc_time - utc_now).total_seconds())
             pause = max(seconds, 1)
 
-        # if first token is 'Currently', it is currently running a query so
-        # check back in recursive_delay seconds
-        elif status_first_token == "Currently":
-            time.sleep(recursive_delay)
-            pause = _get_overpass_pause(base_endpoint)
-
         # any other status is unrecognized: log error, return default duration
         else:
             utils.log(f"Unrecognized server status: {status!r}", level=lg.ERROR)
@@ -183,11 +210,30 @@ def _make_overpass_settings():
     -------
     string
     """
-    if settings.memory is None:
-        maxsize = ""
-    else:
-        maxsize = f"[maxsize:{settings.memory}]"
-    return settings.overpass_settings.format(timeout=settings.timeout, maxsize=maxsize)
+    return _format_overpass_settings(settings.overpass_settings, settings.timeout, settings.memory)
+
+
+@lru_cache(maxsize=16)
+def _format_overpass_settings(overpass_settings, timeout, memory):
+    """
+    Format (and memoize) the settings string to send in Overpass query.
+
+    Parameters
+    ----------
+    overpass_settings : string
+        settings string template with "timeout" and "maxsize" fields
+    timeout : int
+        the timeout interval for the query, in seconds
+    memory : int
+        server memory allocation size for the query, in bytes. if None,
+        server will use its default allocation size
+
+    Returns
+    -------
+    string
+    """
+    maxsize = "" if memory is None else f"[maxsize:{memory}]"
+    return overpass_settings.format(timeout=timeout, maxsize=maxsize)
 
 
 def _make_overpass_polygon_coord_strs(polygon):
@@ -247,33 +293,31 @@ def _create_overpass_query(polygon_coord_str, tags):
         elif isinstance(value, list):
             if not all(isinstance(s, str) for s in value):  # pragma: no cover
                 raise TypeError(err_msg)
-            tags_dict[key] = value
+            # drop duplicate values (keeping their order, so the query string
+            # and thus its cache key stay the same) to avoid redundant queries
+            tags_dict[key] = list(dict.fromkeys(value))
 
         else:  # pragma: no cover
             raise TypeError(err_msg)
 
-    # convert the tags dict into a list of {tag:value} dicts
-    tags_list = []
+    # convert the tags dict into a list of tag filter strings
+    tag_strs = []
     for key, value in tags_dict.items():
         if isinstance(value, bool):
-            tags_list.append({key: value})
+            # if bool (ie, True) just pass the key, no value
+            tag_strs.append(f"[{key!r}]")
         else:
+            # otherwise, pass "key"="value"
             for value_item in value:
-                tags_list.append({key: value_item})  # noqa: PERF401
-
-    # add node/way/relation query components one at a time
-    components = []
-    for d in tags_list:
-        for key, value in d.items():
-            if isinstance(value, bool):
-                # if bool (ie, True) just pass the key, no value
-                tag_str = f"[{key!r}](poly:{polygon_coord_str!r});(._;>;);"
-            else:
-                # otherwise, pass "key"="value"
-                tag_str = f"[{key!r}={value!r}](poly:{polygon_coord_str!r});(._;>;);"
-
-            for kind in ("node", "way", "relation"):
-                components.append(f"({kind}{tag_str});")  # noqa: PERF401
+                tag_strs.append(f"[{key!r}={value_item!r}]")  # noqa: PERF401
+
+    # add node/way/relation query components for each tag, reusing the same
+    # polygon filter string for all of them
+    poly_str = f"(poly:{polygon_coord_str!r});(._;>;);"
+    components = [
+        f"(node{tag_str}{poly_str});(way{tag_str}{poly_str});(relation{tag_str}{poly_str});"
+        for tag_str in tag_strs
+    ]
 
     # finalize query and return
     components = "".join(components)
@@ -312,10 +356,15 @@ def _download_overpass_network(polygon, network_type, custom_filter):
     polygon_coord_strs = _make_overpass_polygon_coord_strs(polygon)
     utils.log(f"Requesting data from API in {len(polygon_coord_strs)} request(s)")
 
-    # pass exterior coordinates of each polygon in list to API, one at a time
-    # the '>' makes it recurse so we get ways and the ways' nodes.
-    for polygon_coord_str in polygon_coord_strs:
-        query_str = f"{overpass_settings};(way{osm_filter}(poly:{polygon_coord_str!r});>;);out;"
+    # build a query for the exterior coordinates of each polygon in list. the
+    # '>' makes it recurse so we get ways and the ways' nodes.
+    query_strs = [
+        f"{overpass_settings};(way{osm_filter}(poly:{polygon_coord_str!r});>;);out;"
+        for polygon_coord_str in polygon_coord_strs
+    ]
+
+    # pass each query to the API, one at a time, to respect its rate limits
+    for query_str in query_strs:
         yield _overpass_request(data={"data": query_str})
 
 
@@ -339,9 +388,14 @@ def _download_overpass_features(polygon, tags):
     polygon_coord_strs = _make_overpass_polygon_coord_strs(polygon)
     utils.log(f"Requesting data from API in {len(polygon_coord_strs)} request(s)")
 
-    # pass exterior coordinates of each polygon in list to API, one at a time
-    for polygon_coord_str in polygon_coord_strs:
-        query_str = _create_overpass_query(polygon_coord_str, tags)
+    # build a query for the exterior coordinates of each polygon in list. this
+    # also validates the tags before any request is made
+    query_strs = [
+        _create_overpass_query(polygon_coord_str, tags) for polygon_coord_str in polygon_coord_strs
+    ]
+
+    # pass each query to the API, one at a time, to respect its rate limits
+    for query_str in query_strs:
         yield _overpass_request(data={"data": query_str})
 
 
@@ -351,7 +405,7 @@ def _overpass_request(data, pause=None, error_pause=60):
 
     Parameters
     ----------
-    data : OrderedDict
+    data : dict
         key-value pairs of parameters
     pause : float
         how long to pause in seconds before request, if None, will query API
@@ -369,7 +423,7 @@ def _overpass_request(data, pause=None, error_pause=60):
 
     # prepare the Overpass API URL and see if request already exists in cache
     url = settings.overpass_endpoint.rstrip("/") + "/interpreter"
-    prepared_url = requests.Request("GET", url, params=data).prepare().url
+    prepared_url = _downloader._prepare_url(url, data)
     cached_response_json = _downloader._retrieve_from_cache(prepared_url)
     if cached_response_json is not None:
         return cached_response_json
@@ -383,7 +437,7 @@ def _overpass_request(data, pause=None, error_pause=60):
 
     # transmit the HTTP POST request
     utils.log(f"Post {prepared_url} with timeout={settings.timeout}")
-    response = requests.post(
+    response = _downloader._session.post(
         url,
         data=data,
         timeout=settings.timeout,
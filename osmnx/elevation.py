@@ -8,7 +8,6 @@ from warnings import warn
 import networkx as nx
 import numpy as np
 import pandas as pd
-import requests
 
 from . import _downloader
 from . import settings
@@ -279,7 +278,7 @@ def _elevation_request(url, pause):
 
     # transmit the HTTP GET request
     utils.log(f"Get {url} with timeout={settings.timeout}")
-    response = requests.get(
+    response = _downloader._session.get(
         url,
         timeout=settings.timeout,
         headers=_downloader._get_http_headers(),
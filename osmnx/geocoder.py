@@ -7,7 +7,6 @@ https://nominatim.org/.
 """
 
 import logging as lg
-from collections import OrderedDict
 from warnings import warn
 
 import geopandas as gpd
@@ -37,7 +36,7 @@ def geocode(query):
         the (lat, lng) coordinates returned by the geocoder
     """
     # define the parameters
-    params = OrderedDict()
+    params = {}
     params["format"] = "json"
     params["limit"] = 1
     params["dedupe"] = 0  # prevent deduping to get precise number of results
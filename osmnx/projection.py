@@ -103,7 +103,7 @@ def project_gdf(gdf, to_crs=None, to_latlong=False):
 
     # otherwise, automatically project the gdf to UTM
     else:
-        if is_projected(gdf.crs):  # pragma: no cover
+        if gdf.crs.is_projected:  # pragma: no cover
             msg = "Geometry must be unprojected to calculate UTM zone"
             raise ValueError(msg)
 
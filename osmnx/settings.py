@@ -12,7 +12,8 @@ bidirectional_network_types : list
     Default is `["walk"]`.
 cache_folder : string or pathlib.Path
     Path to folder in which to save/load HTTP response cache, if the
-    `use_cache` setting equals `True`. Default is `"./cache"`.
+    `use_cache` setting equals `True`. Responses are saved as gzipped JSON
+    files. Default is `"./cache"`.
 cache_only_mode : bool
     If True, download network data from Overpass then raise a
     `CacheOnlyModeInterrupt` error for user to catch. This prevents graph
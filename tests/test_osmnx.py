@@ -7,6 +7,7 @@ import matplotlib as mpl
 mpl.use("Agg")
 
 import bz2
+import gzip
 import logging as lg
 import os
 import tempfile
@@ -20,6 +21,7 @@ import networkx as nx
 import numpy as np
 import pandas as pd
 import pytest
+import requests
 from requests.exceptions import ConnectionError
 from shapely import wkt
 from shapely.geometry import GeometryCollection
@@ -68,6 +70,65 @@ def test_logging():
     ox.ts(style="time")
 
 
+def test_cache():
+    """Test saving to and retrieving from the cache."""
+    url = "https://example.com/api?data=test"
+    response_json = {"elements": [{"id": 1, "lat": 37.8, "lon": -122.2}]}
+    ox._downloader._save_to_cache(url, response_json, True)
+    assert ox._downloader._retrieve_from_cache(url) == response_json
+
+    # responses cached uncompressed by older versions should still be found
+    filepath = Path(ox.settings.cache_folder) / ox._downloader._cache_filename(url)
+    filepath.with_suffix("").write_bytes(gzip.decompress(filepath.read_bytes()))
+    filepath.unlink()
+    assert ox._downloader._retrieve_from_cache(url) == response_json
+
+
+def test_prepare_url():
+    """Test that cache key URLs match the URLs requests would prepare."""
+    # nominatim-style query with non-ascii characters and a None value
+    url = "https://nominatim.openstreetmap.org/search"
+    params = {"format": "json", "q": "Café, Zürich", "key": None}
+    prepared_url = requests.Request("GET", url, params=params).prepare().url
+    assert ox._downloader._prepare_url(url, params) == prepared_url
+
+    # overpass-style query with brackets, quotes, and other special characters
+    url = "https://overpass-api.de/api/interpreter"
+    osm_filter = ox._overpass._get_osm_filter("drive")
+    query = f"[out:json];(way{osm_filter}(poly:'37.8 -122.2 37.9 -122.3');>;);out;"
+    assert all(char in query for char in "[\"'~!|; ")
+    params = {"data": query}
+    prepared_url = requests.Request("GET", url, params=params).prepare().url
+    assert ox._downloader._prepare_url(url, params) == prepared_url
+
+
+def test_overpass_query():
+    """Test creating Overpass features query strings."""
+    polygon_coord_str = "37.8 -122.2 37.9 -122.3"
+    overpass_settings = ox._overpass._make_overpass_settings()
+
+    # query without duplicate tag values should be unchanged, to keep cache keys
+    query = ox._overpass._create_overpass_query(
+        polygon_coord_str, {"building": True, "landuse": ["retail", "farm"]}
+    )
+    poly = f"(poly:{polygon_coord_str!r});(._;>;);"
+    components = "".join(
+        f"({kind}{tag}{poly});"
+        for tag in ("['building']", "['landuse'='retail']", "['landuse'='farm']")
+        for kind in ("node", "way", "relation")
+    )
+    assert query == f"{overpass_settings};({components});out;"
+
+    # duplicate tag values should be dropped from the query
+    query_dupes = ox._overpass._create_overpass_query(
+        polygon_coord_str, {"landuse": ["retail", "retail", "farm"]}
+    )
+    query_unique = ox._overpass._create_overpass_query(
+        polygon_coord_str, {"landuse": ["retail", "farm"]}
+    )
+    assert query_dupes == query_unique
+
+
 def test_coords_rounding():
     """Test the rounding of geometry coordinates."""
     precision = 3